@@ -73,6 +73,11 @@ def stop() -> None:
         istio._client._close()
     istio._client = None
 
+    # the cached opensearch tokens belong to the session being closed
+    from hopsworks_common.core.opensearch_api import OpenSearchApi
+
+    OpenSearchApi._invalidate_authorization_token()
+
 
 def is_saas_connection() -> bool:
     return get_instance()._host == HOSTS.APP_HOST
@@ -25,6 +25,7 @@ from pathlib import Path
 
 import furl
 import requests
+import requests.adapters
 import urllib3
 from hopsworks_common.client import auth, exceptions
 from hopsworks_common.decorators import connected
@@ -52,6 +53,36 @@ class Client:
     DEFAULT_DATABRICKS_ROOT_VIRTUALENV_ENV = "DEFAULT_DATABRICKS_ROOT_VIRTUALENV_ENV"
     HOPSWORKS_PUBLIC_HOST = "HOPSWORKS_PUBLIC_HOST"
 
+    # Connection pools kept by the REST session, and connections kept alive per pool
+    REST_POOL_CONNECTIONS = 10
+    REST_POOL_MAXSIZE = 32
+    # Retries of idempotent requests failing at the connection level
+    REST_MAX_RETRIES = 3
+
+    def _create_session(self) -> requests.Session:
+        """Create the session used to send REST requests.
+
+        Connections are kept alive and reused across requests, including concurrent requests
+        sent from several threads. Idempotent requests are retried on connection errors, such
+        as a kept alive connection having been closed by the server in the meantime.
+
+        :return: the session to send requests with
+        :rtype: requests.Session
+        """
+        session = requests.session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.REST_POOL_CONNECTIONS,
+            pool_maxsize=self.REST_POOL_MAXSIZE,
+            max_retries=urllib3.util.Retry(
+                total=self.REST_MAX_RETRIES,
+                backoff_factor=0.1,
+                respect_retry_after_header=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def _get_verify(self, verify, trust_store_path):
         """Get verification method for sending HTTP requests to Hopsworks.
 
@@ -138,9 +169,9 @@ class Client:
         :param path_params: a list of path params to build the query url from starting after
             the api resource, for example `["project", 119, "featurestores", 67]`.
         :type path_params: list
-        :param query_params: A dictionary of key/value pairs to be added as query parameters,
-            defaults to None
-        :type query_params: dict, optional
+        :param query_params: A dictionary of key/value pairs, or an already url encoded
+            query string, to be added as query parameters, defaults to None
+        :type query_params: dict or str, optional
         :param headers: Additional header information, defaults to None
         :type headers: dict, optional
         :param data: The payload as a python dictionary to be sent as json, defaults to None
@@ -153,13 +184,51 @@ class Client:
         :return: Response json
         :rtype: dict
         """
-        f_url = furl.furl(self._base_url)
-        if with_base_path_params:
-            base_path_params = ["hopsworks-api", "api"]
-            f_url.path.segments = base_path_params + path_params
+        response = self._send_request_raw(
+            method,
+            path_params,
+            query_params=query_params,
+            headers=headers,
+            data=data,
+            stream=stream,
+            files=files,
+            with_base_path_params=with_base_path_params,
+        )
+
+        if response.status_code // 100 != 2:
+            raise exceptions.RestAPIError(
+                self._get_url(path_params, with_base_path_params), response
+            )
+
+        if stream:
+            return response
         else:
-            f_url.path.segments = path_params
-        url = str(f_url)
+            # handle different success response codes
+            if len(response.content) == 0:
+                return None
+            return response.json()
+
+    @connected
+    def _send_request_raw(
+        self,
+        method,
+        path_params,
+        query_params=None,
+        headers=None,
+        data=None,
+        stream=False,
+        files=None,
+        with_base_path_params=True,
+    ):
+        """Send REST request to Hopsworks and return the response as is.
+
+        Takes the same arguments as `_send_request`, but does not validate the status
+        code of the response, e.g. to handle `304 Not Modified` responses.
+
+        :return: Response object
+        :rtype: requests.Response
+        """
+        url = self._get_url(path_params, with_base_path_params)
 
         request = requests.Request(
             method,
@@ -182,16 +251,16 @@ class Client:
                 request, stream, self.TOKEN_EXPIRED_RETRY_INTERVAL, 1
             )
 
-        if response.status_code // 100 != 2:
-            raise exceptions.RestAPIError(url, response)
+        return response
 
-        if stream:
-            return response
+    def _get_url(self, path_params, with_base_path_params=True):
+        f_url = furl.furl(self._base_url)
+        if with_base_path_params:
+            base_path_params = ["hopsworks-api", "api"]
+            f_url.path.segments = base_path_params + path_params
         else:
-            # handle different success response codes
-            if len(response.content) == 0:
-                return None
-            return response.json()
+            f_url.path.segments = path_params
+        return str(f_url)
 
     def _retry_token_expired(self, request, stream, wait, retries):
         """Refresh the JWT token and retry the request. Only on Hopsworks.
@@ -21,7 +21,6 @@ import logging
 import os
 
 import hopsworks_common.client
-import requests
 from hopsworks_common.client import auth, base, exceptions
 from hopsworks_common.client.exceptions import FeatureStoreException
 
@@ -70,7 +69,7 @@ class Client(base.Client):
         self._auth = auth.ApiKeyAuth(api_key)
 
         _logger.debug("Setting up requests session")
-        self._session = requests.session()
+        self._session = self._create_session()
         self._connected = True
 
         self._verify = self._get_verify(hostname_verification, trust_store_path)
@@ -17,7 +17,6 @@
 import os
 from pathlib import Path
 
-import requests
 from hopsworks_common.client import auth, base
 
 
@@ -67,7 +66,7 @@ class Client(base.Client):
         self._verify = self._get_verify(
             self._hostname_verification, self._hopsworks_ca_trust_store_path
         )
-        self._session = requests.session()
+        self._session = self._create_session()
 
         self._connected = True
 
@@ -14,7 +14,6 @@
 #   limitations under the License.
 #
 
-import requests
 from hopsworks_common.client import auth
 from hopsworks_common.client.istio import base as istio
 
@@ -38,7 +37,7 @@ class Client(istio.Client):
 
         self._auth = auth.ApiKeyAuth(api_key_value)
 
-        self._session = requests.session()
+        self._session = self._create_session()
         self._connected = True
         self._verify = self._get_verify(hostname_verification, trust_store_path)
 
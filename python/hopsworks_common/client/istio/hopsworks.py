@@ -16,7 +16,6 @@
 
 import os
 
-import requests
 from hopsworks_common.client import auth, exceptions
 from hopsworks_common.client.istio import base as istio
 
@@ -55,7 +54,7 @@ class Client(istio.Client):
         self._project_name = self._project_name()
         self._auth = auth.ApiKeyAuth(self._get_serving_api_key())
         self._verify = self._get_verify(hostname_verification, trust_store_path)
-        self._session = requests.session()
+        self._session = self._create_session()
 
         self._connected = True
 
@@ -63,6 +63,9 @@ pyarrow_not_installed_message = (
 
 HAS_PANDAS: bool = importlib.util.find_spec("pandas") is not None
 
+# Faster json serialization, used when available
+HAS_ORJSON: bool = importlib.util.find_spec("orjson") is not None
+
 # NumPy
 HAS_NUMPY: bool = importlib.util.find_spec("numpy") is not None
 numpy_not_installed_message = (
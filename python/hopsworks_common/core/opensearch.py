@@ -157,6 +157,8 @@ class OpenSearchClientSingleton:
     def _refresh_opensearch_connection(self):
         self._opensearch_client.close()
         self._opensearch_client = None
+        # the cached jwt might have been revoked, force fetching a new one
+        OpenSearchApi._invalidate_authorization_token()
         self._setup_opensearch_client()
 
     @retry(
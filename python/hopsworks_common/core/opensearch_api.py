@@ -16,14 +16,24 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import base64
+import json
+import threading
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 
-from furl import furl
 from hopsworks_common import client, usage
+from hopsworks_common.client import base
 from hopsworks_common.client.exceptions import FeatureStoreException
 from hopsworks_common.core.variable_api import VariableApi
 
 
+if TYPE_CHECKING:
+    from opensearchpy import OpenSearch
+
+
 class OPENSEARCH_CONFIG:
     ELASTIC_ENDPOINT_ENV_VAR = "ELASTIC_ENDPOINT"
     SSL_CONFIG = "es.net.ssl"
@@ -42,13 +52,41 @@ class OPENSEARCH_CONFIG:
     VERIFY_CERTS = "verify_certs"
     SSL_ASSERT_HOSTNAME = "ssl_assert_hostname"
     CA_CERTS = "ca_certs"
+    POOL_MAXSIZE = "pool_maxsize"
 
 
 class OpenSearchApi:
+    # Seconds before the jwt `exp` claim after which a cached token is refreshed
+    TOKEN_EXPIRY_LEEWAY = 30
+
+    # Tokens are shared by all instances, keyed by cluster url and project id:
+    # (token, expiry epoch). They are dropped when the client is stopped.
+    _token_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    _token_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    _token_locks_guard = threading.Lock()
+
     def __init__(self) -> None:
-        self._variable_api: VariableApi = VariableApi()
+        self._opensearch_url: Optional[str] = None
+        self._opensearch_client: Optional[OpenSearch] = None
+        self._opensearch_client_token: Optional[str] = None
+        self._opensearch_client_lock = threading.Lock()
+        # (project name, lower cased index prefix of the project)
+        self._index_prefix: Optional[Tuple[str, str]] = None
+
+    @cached_property
+    def _variable_api(self) -> VariableApi:
+        return VariableApi()
 
     def _get_opensearch_url(self) -> str:
+        # the url only depends on the cluster configuration, resolve it once
+        if self._opensearch_url is None:
+            self._opensearch_url = self._resolve_opensearch_url()
+        return self._opensearch_url
+
+    def _invalidate_opensearch_url(self) -> None:
+        self._opensearch_url = None
+
+    def _resolve_opensearch_url(self) -> str:
         if client._is_external():
             external_domain = self._variable_api.get_loadbalancer_external_domain(
                 "opensearch"
@@ -63,7 +101,6 @@ class OpenSearchApi:
                 )
             return f"https://rest.elastic.service.{service_discovery_domain}:9200"
 
-    @usage.method_logger
     def get_project_index(self, index: str) -> str:
         """
         This helper method prefixes the supplied index name with the project name to avoid index name clashes.
@@ -74,14 +111,73 @@ class OpenSearchApi:
         # Returns
             `str`: A valid opensearch index name.
         """
+        project_name = client.get_instance()._project_name
+        if self._index_prefix is None or self._index_prefix[0] != project_name:
+            self._index_prefix = (project_name, (project_name + "_").lower())
+        return self._index_prefix[1] + (index if index.islower() else index.lower())
+
+    @usage.method_logger
+    def get_client(self) -> OpenSearch:
+        """
+        Get an *opensearch-py* client connected to the OpenSearch cluster of the project.
+
+        The client is created on first use and shared by subsequent calls, so that its
+        connections are reused. It is recreated when the authorization token is rotated.
+
+        ```python
+
+        import hopsworks
+
+        project = hopsworks.login()
+
+        opensearch_api = project.get_opensearch_api()
+
+        client = opensearch_api.get_client()
+
+        ```
+
+        # Returns
+            `OpenSearch`: The shared OpenSearch client.
+        """
+        from opensearchpy import OpenSearch
+
         _client = client.get_instance()
-        return (_client._project_name + "_" + index).lower()
+        with self._opensearch_client_lock:
+            if (
+                self._opensearch_client is not None
+                and self._get_token_expiry(self._opensearch_client_token) is None
+            ):
+                # tokens without an `exp` claim are not cached, nor rotated
+                return self._opensearch_client
+
+            # the token is fetched again only if it is not cached anymore
+            token = self._get_authorization_token(_client)
+            if (
+                self._opensearch_client is not None
+                and token == self._opensearch_client_token
+            ):
+                return self._opensearch_client
+
+            self._close_client()
+            self._opensearch_client = OpenSearch(
+                **self._build_py_config(_client, token)
+            )
+            self._opensearch_client_token = token
+            return self._opensearch_client
+
+    def _close_client(self) -> None:
+        if self._opensearch_client is not None:
+            self._opensearch_client.close()
+        self._opensearch_client = None
+        self._opensearch_client_token = None
 
     @usage.method_logger
-    def get_default_py_config(self) -> Dict[str, Any]:
+    def get_default_py_config(self, pool_maxsize: int = 32) -> Dict[str, Any]:
         """
         Get the required opensearch configuration to setup a connection using the *opensearch-py* library.
 
+        Use `get_client` to get a shared client instead, unless the connection needs to be customized.
+
         ```python
 
         import hopsworks
@@ -95,33 +191,99 @@ class OpenSearchApi:
 
         ```
 
+        # Arguments
+            pool_maxsize: Maximum number of connections kept open per host, defaults to 32.
+                Increase it when sharing the client across many threads.
+
         # Returns
             `dict`: A dictionary with required configuration.
         """
-        url = furl(self._get_opensearch_url())
+        _client = client.get_instance()
+        return self._build_py_config(
+            _client, self._get_authorization_token(_client), pool_maxsize
+        )
+
+    def _build_py_config(
+        self, _client: base.Client, token: str, pool_maxsize: int = 32
+    ) -> Dict[str, Any]:
+        url = urlsplit(self._get_opensearch_url())
         return {
-            OPENSEARCH_CONFIG.HOSTS: [{"host": url.host, "port": url.port}],
+            OPENSEARCH_CONFIG.HOSTS: [{"host": url.hostname, "port": url.port}],
             OPENSEARCH_CONFIG.HTTP_COMPRESS: False,
-            OPENSEARCH_CONFIG.HEADERS: {
-                "Authorization": self._get_authorization_token()
-            },
+            OPENSEARCH_CONFIG.HEADERS: {"Authorization": token},
             OPENSEARCH_CONFIG.USE_SSL: True,
             OPENSEARCH_CONFIG.VERIFY_CERTS: True,
             OPENSEARCH_CONFIG.SSL_ASSERT_HOSTNAME: False,
-            OPENSEARCH_CONFIG.CA_CERTS: client.get_instance()._get_ca_chain_path(),
+            OPENSEARCH_CONFIG.CA_CERTS: _client._get_ca_chain_path(),
+            OPENSEARCH_CONFIG.POOL_MAXSIZE: pool_maxsize,
         }
 
-    def _get_authorization_token(self) -> str:
+    def _get_authorization_token(self, _client: Optional[base.Client] = None) -> str:
         """Get opensearch jwt token.
 
+        The token is cached per cluster and project, and reused until shortly before it expires.
+
+        # Arguments
+            _client: The client to send the request with, defaults to the current client instance.
+
         # Returns
             `str`: OpenSearch jwt token
         # Raises
             `hopsworks.client.exceptions.RestAPIError`: If the backend encounters an error when handling the request
         """
 
-        _client = client.get_instance()
-        path_params = ["elastic", "jwt", _client._project_id]
+        if _client is None:
+            _client = client.get_instance()
+        project_id = _client._project_id
+        key = (_client._base_url, project_id)
+
+        cached = self._get_cached_token(key)
+        if cached is not None:
+            return cached
+
+        with self._get_token_lock(key):
+            # another thread might have refreshed the token while we were waiting
+            cached = self._get_cached_token(key)
+            if cached is not None:
+                return cached
+
+            path_params = ["elastic", "jwt", project_id]
+            headers = {"content-type": "application/json"}
+            token = _client._send_request("GET", path_params, headers=headers)["token"]
+
+            expiry = self._get_token_expiry(token)
+            if expiry is not None:
+                OpenSearchApi._token_cache[key] = (token, expiry)
+            return token
+
+    @classmethod
+    def _invalidate_authorization_token(cls, project_id: Optional[str] = None) -> None:
+        """Drop the cached jwt token of a project, or of all projects if none is given."""
+        if project_id is None:
+            cls._token_cache.clear()
+        else:
+            for key in list(cls._token_cache):
+                if key[1] == project_id:
+                    del cls._token_cache[key]
+
+    @classmethod
+    def _get_cached_token(cls, key: Tuple[str, str]) -> Optional[str]:
+        cached = cls._token_cache.get(key)
+        if cached is not None and time.time() < cached[1] - cls.TOKEN_EXPIRY_LEEWAY:
+            return cached[0]
+        return None
+
+    @classmethod
+    def _get_token_lock(cls, key: Tuple[str, str]) -> threading.Lock:
+        with cls._token_locks_guard:
+            return cls._token_locks.setdefault(key, threading.Lock())
 
-        headers = {"content-type": "application/json"}
-        return _client._send_request("GET", path_params, headers=headers)["token"]
+    @staticmethod
+    def _get_token_expiry(token: str) -> Optional[float]:
+        """Read the `exp` claim from the payload of a jwt, the token may be prefixed with its scheme."""
+        try:
+            payload = token.split(" ")[-1].split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
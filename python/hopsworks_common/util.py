@@ -20,6 +20,7 @@ import asyncio
 import inspect
 import itertools
 import json
+import math
 import os
 import queue
 import re
@@ -35,11 +36,14 @@ import humps
 from hopsworks_common import client
 from hopsworks_common.client.exceptions import FeatureStoreException, JobException
 from hopsworks_common.constants import MODEL, PREDICTOR, Default
-from hopsworks_common.core.constants import HAS_PANDAS
+from hopsworks_common.core.constants import HAS_ORJSON, HAS_PANDAS
 from hopsworks_common.git_file_status import GitFileStatus
 from six import string_types
 
 
+if HAS_ORJSON:
+    import orjson
+
 if HAS_PANDAS:
     import pandas as pd
 
@@ -59,6 +63,79 @@ class Encoder(json.JSONEncoder):
             return super().default(o)
 
 
+def _has_non_finite(obj: Any) -> bool:
+    # orjson writes NaN and Infinity as null, unlike json
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(map(_has_non_finite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+def _orjson_default(o: Any) -> Dict[str, Any]:
+    # orjson counterpart of Encoder
+    try:
+        obj = o.to_dict()
+    except AttributeError:
+        raise TypeError(f"Type {type(o)} is not JSON serializable") from None
+    if _has_non_finite(obj):
+        raise TypeError("Out of range float values are serialized by json")
+    return obj
+
+
+def _orjson_dumps(obj: Any) -> Optional[bytes]:
+    # None if orjson could serialize obj to a different value than json with Encoder
+    if _has_non_finite(obj):
+        return None
+    try:
+        # types orjson would serialize natively go through the default hook
+        return orjson.dumps(
+            obj,
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    except TypeError:
+        # e.g. numpy scalars, non-str keys or non-finite floats, which json
+        # handles differently
+        return None
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to json, using orjson if it is installed.
+
+    Objects are serialized through their `to_dict` method, as with `Encoder`. The
+    output of orjson is more compact than the one of json, but it decodes to the
+    same value whether or not orjson is installed.
+    """
+    if HAS_ORJSON:
+        payload = _orjson_dumps(obj)
+        if payload is not None:
+            return payload.decode()
+    return json.dumps(obj, cls=Encoder)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 encoded json, see `json_dumps`."""
+    if HAS_ORJSON:
+        payload = _orjson_dumps(obj)
+        if payload is not None:
+            return payload
+    return json.dumps(obj, cls=Encoder).encode("utf-8")
+
+
+def json_loads(s: Union[bytes, str]) -> Any:
+    """Deserialize json, using orjson if it is installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or Infinity, which json accepts
+            pass
+    return json.loads(s)
+
+
 class NumpyEncoder(json.JSONEncoder):
     """Special json encoder for numpy types.
     Note that some numpy types doesn't have native python equivalence,
@@ -21,6 +21,7 @@ from hopsworks_common.core.constants import (
     HAS_FAST_AVRO,
     HAS_GREAT_EXPECTATIONS,
     HAS_NUMPY,
+    HAS_ORJSON,
     HAS_PANDAS,
     HAS_POLARS,
     HAS_PYARROW,
@@ -38,6 +39,7 @@ __all__ = [
     "HAS_FAST_AVRO",
     "HAS_GREAT_EXPECTATIONS",
     "HAS_NUMPY",
+    "HAS_ORJSON",
     "HAS_PANDAS",
     "HAS_POLARS",
     "HAS_SQLALCHEMY",
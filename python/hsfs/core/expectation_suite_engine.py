@@ -15,13 +15,12 @@
 #
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Optional
 
 from hopsworks_common import client
 from hsfs import expectation_suite as es
 from hsfs import util
 from hsfs.core import expectation_suite_api
-from hsfs.ge_expectation import GeExpectation
 
 
 class ExpectationSuiteEngine:
@@ -66,31 +65,6 @@ class ExpectationSuiteEngine:
     ) -> es.ExpectationSuite:
         return self._expectation_suite_api.update_metadata(expectation_suite)
 
-    def update_metadata_from_fields(
-        self,
-        id: int,
-        feature_group_id: int,
-        feature_store_id: int,
-        expectation_suite_name: str,
-        run_validation: bool,
-        validation_ingestion_policy: str,
-        meta: Union[str, Dict[str, Any]],
-        expectations: List[GeExpectation],
-        **kwargs,
-    ) -> None:
-        self._expectation_suite_api.update_metadata(
-            es.ExpectationSuite(
-                id=id,
-                expectation_suite_name=expectation_suite_name,
-                run_validation=run_validation,
-                validation_ingestion_policy=validation_ingestion_policy,
-                meta=meta,
-                feature_group_id=feature_group_id,
-                feature_store_id=feature_store_id,
-                expectations=expectations,
-            )
-        )
-
     def get(self) -> Optional[es.ExpectationSuite]:
         return self._expectation_suite_api.get()
 
@@ -15,9 +15,10 @@
 #
 from __future__ import annotations
 
-import json
 import re
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Union
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Union
 
 
 if TYPE_CHECKING:
@@ -32,7 +33,6 @@ from hsfs.core.constants import (
     initialise_expectation_suite_for_single_expectation_api_message,
 )
 from hsfs.core.expectation_engine import ExpectationEngine
-from hsfs.core.variable_api import VariableApi
 
 # if great_expectations is not installed, we will default to using native Hopsworks class as return values
 from hsfs.decorators import uses_great_expectations
@@ -42,10 +42,51 @@ from hsfs.ge_expectation import GeExpectation
 if HAS_GREAT_EXPECTATIONS:
     import great_expectations
 
+_HREF_PATTERN = re.compile(r"/featurestores/(\d+)/featuregroups/(\d+)/expectationsuite")
+
+
+# Response keys come from a small fixed set, so their conversion is memoized
+_decamelize_key = lru_cache(maxsize=512)(humps.decamelize)
+
+
+def _decamelize(obj: Any) -> Any:
+    """Equivalent of `humps.decamelize` which converts each distinct key only once."""
+    if isinstance(obj, list):
+        return [_decamelize(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {_decamelize_key(k): _decamelize(v) for k, v in obj.items()}
+    return obj
+
 
 class ExpectationSuite:
     """Metadata object representing a feature validation expectation in the Feature Store."""
 
+    __slots__ = (
+        "_id",
+        "_expectation_suite_name",
+        "_ge_cloud_id",
+        "_data_asset_type",
+        "_run_validation",
+        "_validation_ingestion_policy",
+        "_expectations",
+        "_href",
+        "_feature_store_id",
+        "_feature_group_id",
+        "_meta",
+        "_expectation_engine",
+        "_expectation_suite_engine",
+    )
+
+    # Conversion to GeExpectation by exact type, other types go through _convert_expectation
+    _EXPECTATION_CONVERTERS: Dict[type, Callable[[Any], GeExpectation]] = {
+        dict: lambda expectation: GeExpectation(**expectation),
+        GeExpectation: lambda expectation: expectation,
+    }
+    if HAS_GREAT_EXPECTATIONS:
+        _EXPECTATION_CONVERTERS[great_expectations.core.ExpectationConfiguration] = (
+            lambda expectation: GeExpectation(**expectation.to_json_dict())
+        )
+
     def __init__(
         self,
         expectation_suite_name: str,
@@ -70,7 +111,9 @@ class ExpectationSuite:
         self._ge_cloud_id = kwargs.get("ge_cloud_id", None)
         self._data_asset_type = kwargs.get("data_asset_type", None)
         self._run_validation = run_validation
-        self._validation_ingestion_policy = validation_ingestion_policy.upper()
+        self._validation_ingestion_policy = self._normalize_ingestion_policy(
+            validation_ingestion_policy
+        )
         self._expectations = []
         self._href = href
 
@@ -83,12 +126,14 @@ class ExpectationSuite:
             self._feature_group_id = None
             self._feature_store_id = None
 
-        self._variable_api: VariableApi = VariableApi()
-
-        # use setters because these need to be transformed from stringified json
+        # use setter because expectations need to be converted to GeExpectation
         self.expectations = expectations
-        self.meta = meta
+        # bypass setter to not push metadata to the backend on init
+        self._meta = self._parse_meta(meta)
 
+        self._init_engines()
+
+    def _init_engines(self) -> None:
         self._expectation_engine: Optional[ExpectationEngine] = None
         self._expectation_suite_engine: Optional[
             expectation_suite_engine.ExpectationSuiteEngine
@@ -117,18 +162,49 @@ class ExpectationSuite:
     def from_response_json(
         cls, json_dict: Dict[str, Any]
     ) -> Optional[Union[ExpectationSuite, List[ExpectationSuite]]]:
-        json_decamelized = humps.decamelize(json_dict)
+        json_decamelized = _decamelize(json_dict)
         if (
             "count" in json_decamelized
         ):  # todo count is expected also when providing dict
             if json_decamelized["count"] == 0:
                 return None
             return [
-                cls(**expectation_suite)
+                cls._from_decoded(expectation_suite)
                 for expectation_suite in json_decamelized["items"]
             ]
         else:
-            return cls(**json_decamelized)
+            return cls._from_decoded(json_decamelized)
+
+    @classmethod
+    def _from_decoded(cls, json_decamelized: Dict[str, Any]) -> ExpectationSuite:
+        """Build a suite from a decamelized backend response without going through `__init__`.
+
+        Mirrors `__init__` for the fields returned by the backend.
+        """
+        suite = cls.__new__(cls)
+        suite._id = json_decamelized.get("id")
+        suite._expectation_suite_name = json_decamelized["expectation_suite_name"]
+        suite._ge_cloud_id = json_decamelized.get("ge_cloud_id")
+        suite._data_asset_type = json_decamelized.get("data_asset_type")
+        suite._run_validation = json_decamelized.get("run_validation", True)
+        suite._validation_ingestion_policy = cls._normalize_ingestion_policy(
+            json_decamelized.get("validation_ingestion_policy", "always")
+        )
+        suite._href = json_decamelized.get("href")
+
+        suite._feature_store_id = json_decamelized.get("feature_store_id")
+        suite._feature_group_id = json_decamelized.get("feature_group_id")
+        if suite._feature_store_id is None or suite._feature_group_id is None:
+            if suite._href is not None:
+                suite._init_feature_store_and_feature_group_ids_from_href(suite._href)
+            else:
+                suite._feature_store_id = None
+                suite._feature_group_id = None
+
+        suite.expectations = json_decamelized.get("expectations")
+        suite._meta = cls._parse_meta(json_decamelized.get("meta", {}))
+        suite._init_engines()
+        return suite
 
     @classmethod
     @uses_great_expectations
@@ -174,42 +250,42 @@ class ExpectationSuite:
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self._id,
-            "featureStoreId": self._feature_store_id,
-            "featureGroupId": self._feature_group_id,
-            "expectationSuiteName": self._expectation_suite_name,
-            "expectations": self._expectations,
-            "meta": json.dumps(self._meta),
-            "geCloudId": self._ge_cloud_id,
-            "dataAssetType": self._data_asset_type,
-            "runValidation": self._run_validation,
-            "validationIngestionPolicy": self._validation_ingestion_policy.upper(),
-        }
+        return self._to_payload(
+            expectations=self._expectations, meta=util.json_dumps(self._meta)
+        )
 
     def to_json_dict(self, decamelize: bool = False) -> Dict[str, Any]:
-        the_dict = {
+        the_dict = self._to_payload(
+            expectations=[
+                expectation.to_json_dict() for expectation in self._expectations
+            ],
+            meta=self._meta,
+        )
+
+        if decamelize:
+            return humps.decamelize(the_dict)
+        else:
+            return the_dict
+
+    def _to_payload(
+        self, expectations: List[Any], meta: Union[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Fields shared by `to_dict` and `to_json_dict`, which only differ in how expectations and meta are represented."""
+        return {
             "id": self._id,
             "featureStoreId": self._feature_store_id,
             "featureGroupId": self._feature_group_id,
             "expectationSuiteName": self._expectation_suite_name,
-            "expectations": [
-                expectation.to_json_dict() for expectation in self._expectations
-            ],
-            "meta": self._meta,
+            "expectations": expectations,
+            "meta": meta,
             "geCloudId": self._ge_cloud_id,
             "dataAssetType": self._data_asset_type,
             "runValidation": self._run_validation,
-            "validationIngestionPolicy": self._validation_ingestion_policy.upper(),
+            "validationIngestionPolicy": self._validation_ingestion_policy,
         }
 
-        if decamelize:
-            return humps.decamelize(the_dict)
-        else:
-            return the_dict
-
     def json(self) -> str:
-        return json.dumps(self, cls=util.Encoder)
+        return util.json_dumps(self)
 
     @uses_great_expectations
     def to_ge_type(self) -> great_expectations.core.ExpectationSuite:
@@ -224,10 +300,7 @@ class ExpectationSuite:
         )
 
     def _init_feature_store_and_feature_group_ids_from_href(self, href: str) -> None:
-        feature_store_id, feature_group_id = re.search(
-            r"\/featurestores\/(\d+)\/featuregroups\/(\d+)\/expectationsuite*",
-            href,
-        ).groups(0)
+        feature_store_id, feature_group_id = _HREF_PATTERN.search(href).groups()
         self._feature_store_id = int(feature_store_id)
         self._feature_group_id = int(feature_group_id)
 
@@ -347,6 +420,7 @@ class ExpectationSuite:
             GeExpectation, great_expectations.core.ExpectationConfiguration
         ],
         ge_type: bool = HAS_GREAT_EXPECTATIONS,
+        refresh: bool = False,
     ) -> Union[GeExpectation, great_expectations.core.ExpectationConfiguration]:
         """
         Append an expectation to the local suite or in the backend if attached to a Feature Group.
@@ -381,6 +455,8 @@ class ExpectationSuite:
             expectation: The new expectation object.
             ge_type: Whether to return native Great Expectations object or Hopsworks abstraction,
                 defaults to True if great_expectations is installed else false.
+            refresh: Whether to fetch all expectations of the suite from the backend after the change
+                instead of only updating the local list, defaults to False.
 
         # Returns
             The new expectation attached to the Feature Group.
@@ -394,7 +470,12 @@ class ExpectationSuite:
             converted_expectation = self._expectation_engine.create(
                 expectation=converted_expectation
             )
-            self.expectations = self._expectation_engine.get_expectations_by_suite_id()
+            if refresh:
+                self.expectations = (
+                    self._expectation_engine.get_expectations_by_suite_id()
+                )
+            else:
+                self._expectations.append(converted_expectation)
             if ge_type:
                 return converted_expectation.to_ge_type()
             else:
@@ -410,6 +491,7 @@ class ExpectationSuite:
             GeExpectation, great_expectations.core.ExpectationConfiguration
         ],
         ge_type: bool = HAS_GREAT_EXPECTATIONS,
+        refresh: bool = False,
     ) -> Union[GeExpectation, great_expectations.core.ExpectationConfiguration]:
         """
         Update an expectation from the suite locally or from the backend if attached to a Feature Group.
@@ -423,6 +505,8 @@ class ExpectationSuite:
             expectation: The updated expectation object. The meta field should contain an expectationId field.
             ge_type: Whether to return native Great Expectations object or Hopsworks abstraction,
                 defaults to True if great_expectations is installed else false.
+            refresh: Whether to fetch all expectations of the suite from the backend after the change
+                instead of only updating the local list, defaults to False.
 
         # Returns
             The updated expectation attached to the Feature Group.
@@ -438,8 +522,12 @@ class ExpectationSuite:
             converted_expectation = self._expectation_engine.update(
                 expectation=converted_expectation
             )
-            # Fetch the expectations from backend to avoid sync issues
-            self.expectations = self._expectation_engine.get_expectations_by_suite_id()
+            if refresh:
+                self.expectations = (
+                    self._expectation_engine.get_expectations_by_suite_id()
+                )
+            else:
+                self._replace_local_expectation(converted_expectation)
 
             if ge_type:
                 return converted_expectation.to_ge_type()
@@ -450,7 +538,9 @@ class ExpectationSuite:
                 initialise_expectation_suite_for_single_expectation_api_message
             )
 
-    def remove_expectation(self, expectation_id: Optional[int] = None) -> None:
+    def remove_expectation(
+        self, expectation_id: Optional[int] = None, refresh: bool = False
+    ) -> None:
         """
         Remove an expectation from the suite locally and from the backend if attached to a Feature Group.
 
@@ -461,6 +551,8 @@ class ExpectationSuite:
 
         # Arguments
             expectation_id: Id of the expectation to remove. The expectation will be deleted both locally and from the backend.
+            refresh: Whether to fetch all expectations of the suite from the backend after the change
+                instead of only updating the local list, defaults to False.
 
         # Raises
             `hopsworks.client.exceptions.RestAPIError`: If the backend encounters an error when handling the request
@@ -468,12 +560,28 @@ class ExpectationSuite:
         """
         if self.id:
             self._expectation_engine.delete(expectation_id=expectation_id)
-            self.expectations = self._expectation_engine.get_expectations_by_suite_id()
+            if refresh:
+                self.expectations = (
+                    self._expectation_engine.get_expectations_by_suite_id()
+                )
+            else:
+                self._expectations = [
+                    expectation
+                    for expectation in self._expectations
+                    if expectation.id != expectation_id
+                ]
         else:
             raise FeatureStoreException(
                 initialise_expectation_suite_for_single_expectation_api_message
             )
 
+    def _replace_local_expectation(self, expectation: GeExpectation) -> None:
+        for index, local_expectation in enumerate(self._expectations):
+            if local_expectation.id == expectation.id:
+                self._expectations[index] = expectation
+                return
+        self._expectations.append(expectation)
+
     # End of single expectation API
 
     def __str__(self) -> str:
@@ -517,10 +625,7 @@ class ExpectationSuite:
     @expectation_suite_name.setter
     def expectation_suite_name(self, expectation_suite_name: str) -> None:
         self._expectation_suite_name = expectation_suite_name
-        if self.id:
-            self._expectation_suite_engine.update_metadata_from_fields(
-                **humps.decamelize(self.to_dict())
-            )
+        self._update_metadata()
 
     @property
     def data_asset_type(self) -> Optional[str]:
@@ -548,10 +653,7 @@ class ExpectationSuite:
     @run_validation.setter
     def run_validation(self, run_validation: bool) -> None:
         self._run_validation = run_validation
-        if self.id:
-            self._expectation_suite_engine.update_metadata_from_fields(
-                **humps.decamelize(self.to_dict())
-            )
+        self._update_metadata()
 
     @property
     def validation_ingestion_policy(self) -> Literal["always", "strict"]:
@@ -566,11 +668,15 @@ class ExpectationSuite:
     def validation_ingestion_policy(
         self, validation_ingestion_policy: Literal["always", "strict"]
     ) -> None:
-        self._validation_ingestion_policy = validation_ingestion_policy.upper()
-        if self.id:
-            self._expectation_suite_engine.update_metadata_from_fields(
-                **humps.decamelize(self.to_dict())
-            )
+        self._validation_ingestion_policy = self._normalize_ingestion_policy(
+            validation_ingestion_policy
+        )
+        self._update_metadata()
+
+    @staticmethod
+    def _normalize_ingestion_policy(validation_ingestion_policy: str) -> str:
+        # policies are compared and serialized upper cased, intern the few possible values
+        return sys.intern(validation_ingestion_policy.upper())
 
     @property
     def expectations(self) -> List[GeExpectation]:
@@ -590,8 +696,12 @@ class ExpectationSuite:
         if expectations is None:
             self._expectations = []
         elif isinstance(expectations, list):
+            converters = self._EXPECTATION_CONVERTERS
             self._expectations = [
-                self._convert_expectation(expectation) for expectation in expectations
+                converters.get(type(expectation), self._convert_expectation)(
+                    expectation
+                )
+                for expectation in expectations
             ]
         else:
             raise TypeError(
@@ -605,15 +715,19 @@ class ExpectationSuite:
 
     @meta.setter
     def meta(self, meta: Union[str, dict]) -> None:
+        self._meta = self._parse_meta(meta)
+        self._update_metadata()
+
+    @staticmethod
+    def _parse_meta(meta: Union[str, dict]) -> Dict[str, Any]:
         if isinstance(meta, dict):
-            self._meta = meta
+            return meta
         elif isinstance(meta, str):
-            self._meta = json.loads(meta)
+            return util.json_loads(meta)
         else:
             raise ValueError("Meta field must be stringified json or dict.")
 
-        if self._id and hasattr(self, "_expectation_suite_engine"):
-            # Adding test on suite_engine allows to not run it on init
-            self._expectation_suite_engine.update_metadata_from_fields(
-                **humps.decamelize(self.to_dict())
-            )
+    def _update_metadata(self) -> None:
+        """Push the metadata of a suite registered in the backend after one of its fields changed."""
+        if self.id:
+            self._expectation_suite_engine.update_metadata(self)
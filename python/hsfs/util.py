@@ -46,6 +46,8 @@ from hopsworks_common.util import (
     get_timestamp_from_date_string,
     is_interactive,
     is_runtime_notebook,
+    json_dumps,
+    json_loads,
     run_with_loading_animation,
     strip_feature_store_suffix,
     validate_embedding_feature_type,
@@ -138,6 +140,8 @@ __all__ = [
     "get_timestamp_from_date_string",
     "is_interactive",
     "is_runtime_notebook",
+    "json_dumps",
+    "json_loads",
     "run_with_loading_animation",
     "strip_feature_store_suffix",
     "validate_embedding_feature_type",
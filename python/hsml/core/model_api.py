@@ -14,16 +14,56 @@
 #   limitations under the License.
 #
 
-import json
-from typing import Union
-
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote_plus
+
+from hopsworks_common import util
 from hsml import client, decorators, model, tag
 from hsml.core import explicit_provenance
 
 
+# Query string shared by the model reads, url encoded once
+_EXPAND_TRAINING_DATASETS = "expand=trainingdatasets"
+
+
+def _tags_to_dict(tags_json: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Equivalent of parsing the response with tag.Tag.from_response_json, without
+    # decamelizing the response or building the intermediate Tag objects
+    if not tags_json or not tags_json.get("count"):
+        return {}
+    loads = util.json_loads
+    tags = {}
+    for item in tags_json["items"]:
+        value = item["value"]
+        tags[item["name"]] = loads(value) if isinstance(value, (str, bytes)) else value
+    return tags
+
+
+@lru_cache(maxsize=64)
+def _models_base_path(project_id: int, model_registry_id: int) -> Tuple:
+    return ("project", project_id, "modelregistries", str(model_registry_id), "models")
+
+
 class ModelApi:
-    def __init__(self):
-        pass
+    __slots__ = ()
+
+    # Read-aside cache of the decoded model and tag responses, shared by all
+    # instances. Disabled by default, set CACHE_TTL to a number of seconds to
+    # enable it.
+    CACHE_TTL = 0
+    CACHE_MAXSIZE = 1024
+    _cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    # ETag and decoded json of the last response of each conditional GET, shared
+    # by all instances as every model builds its own engine and api objects
+    _etag_cache: "OrderedDict[tuple, Tuple[str, Any]]" = OrderedDict()
+    _etag_lock = threading.Lock()
 
     def put(self, model_instance, query_params):
         """Save model metadata to the model registry.
@@ -34,24 +74,21 @@ class ModelApi:
         :rtype: Model
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.name + "_" + str(model_instance.version),
-        ]
+        path_params = self._models_path(
+            _client,
+            model_instance.model_registry_id,
+            f"{model_instance.name}_{model_instance.version}",
+        )
         headers = {"content-type": "application/json"}
-        return model_instance.update_from_response_json(
-            _client._send_request(
-                "PUT",
-                path_params,
-                headers=headers,
-                query_params=query_params,
-                data=model_instance.json(),
-            )
+        model_json = _client._send_request(
+            "PUT",
+            path_params,
+            headers=headers,
+            query_params=query_params,
+            data=model_instance.json_bytes(),
         )
+        self.invalidate(model_instance)
+        return model_instance.update_from_response_json(model_json)
 
     @decorators.catch_not_found("hsml.model.Model", fallback_return=None)
     def get(self, name, version, model_registry_id, shared_registry_project_name=None):
@@ -65,21 +102,25 @@ class ModelApi:
         :rtype: Model
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
+        cache_key = (
+            "model",
             _client._project_id,
-            "modelregistries",
-            model_registry_id,
-            "models",
-            name + "_" + str(version),
-        ]
-        query_params = {"expand": "trainingdatasets"}
-
-        model_json = _client._send_request("GET", path_params, query_params)
+            str(model_registry_id),
+            name,
+            version,
+            shared_registry_project_name,
+        )
+        # the decoded json is cached, so each call returns a model object of its own
+        model_json = self._cache_get(cache_key)
+        if model_json is None:
+            path_params = self._models_path(
+                _client, model_registry_id, f"{name}_{version}"
+            )
+            model_json = self._get_json(_client, path_params, _EXPAND_TRAINING_DATASETS)
+            self._cache_set(cache_key, model_json)
         model_meta = model.Model.from_response_json(model_json)
 
         model_meta.shared_registry_project_name = shared_registry_project_name
-
         return model_meta
 
     def get_models(
@@ -103,28 +144,34 @@ class ModelApi:
         """
 
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            model_registry_id,
+        cache_key = (
             "models",
-        ]
-        query_params = {
-            "expand": "trainingdatasets",
-            "filter_by": ["name_eq:" + name],
-        }
+            _client._project_id,
+            str(model_registry_id),
+            name,
+            metric,
+            direction,
+            shared_registry_project_name,
+        )
+        model_json = self._cache_get(cache_key)
+        if model_json is None:
+            path_params = self._models_path(_client, model_registry_id)
+            query_params = (
+                f"{_EXPAND_TRAINING_DATASETS}&filter_by={quote_plus('name_eq:' + name)}"
+            )
 
-        if metric is not None and direction is not None:
-            if direction.lower() == "max":
-                direction = "desc"
-            elif direction.lower() == "min":
-                direction = "asc"
+            if metric is not None and direction is not None:
+                if direction.lower() == "max":
+                    direction = "desc"
+                elif direction.lower() == "min":
+                    direction = "asc"
 
-            query_params["sort_by"] = metric + ":" + direction
-            query_params["limit"] = "1"
+                query_params += (
+                    f"&sort_by={quote_plus(metric + ':' + direction)}&limit=1"
+                )
 
-        model_json = _client._send_request("GET", path_params, query_params)
+            model_json = self._get_json(_client, path_params, query_params)
+            self._cache_set(cache_key, model_json)
         models_meta = model.Model.from_response_json(model_json)
 
         for model_meta in models_meta:
@@ -132,6 +179,77 @@ class ModelApi:
 
         return models_meta
 
+    def iter_models(
+        self,
+        name,
+        model_registry_id,
+        shared_registry_project_name=None,
+        page_size: int = 100,
+    ):
+        """Iterate over the metadata of the models with a certain name, page by page.
+
+        Only one page of models is requested and held in memory at a time. The models
+        endpoint does not document a sort key for versions, so the pages are not
+        assumed to be in a stable order: versions seen on an earlier page are skipped,
+        and if fewer versions than the reported count were seen, the missing ones are
+        requested at once in a final unpaged request.
+
+        :param name: name of the model
+        :type name: str
+        :param model_registry_id: id of the model registry the models belong to
+        :type model_registry_id: int
+        :param shared_registry_project_name: name of the project sharing the model
+            registry, if it is not the registry of the current project
+        :type shared_registry_project_name: str
+        :param page_size: number of models requested at a time
+        :type page_size: int
+        :return: generator of model metadata objects
+        :rtype: Iterator[Model]
+        """
+        _client = client.get_instance()
+        path_params = self._models_path(_client, model_registry_id)
+        base_query_params = (
+            f"{_EXPAND_TRAINING_DATASETS}&filter_by={quote_plus('name_eq:' + name)}"
+        )
+        seen_versions = set()
+        count = None
+        offset = 0
+        while True:
+            query_params = f"{base_query_params}&offset={offset}&limit={page_size}"
+            model_json = _client._send_request("GET", path_params, query_params) or {}
+            items = model_json.get("items") or []
+            count = model_json.get("count")
+
+            yield from self._new_models(
+                items, seen_versions, shared_registry_project_name
+            )
+
+            offset += len(items)
+            if len(items) < page_size or (count is not None and offset >= count):
+                break
+
+        if count is not None and len(seen_versions) < count:
+            # the order of the models changed between two pages
+            model_json = self._get_json(_client, path_params, base_query_params) or {}
+            yield from self._new_models(
+                model_json.get("items") or [],
+                seen_versions,
+                shared_registry_project_name,
+            )
+
+    @staticmethod
+    def _new_models(items, seen_versions, shared_registry_project_name):
+        # models of the page whose version has not been yielded yet
+        models_meta = model.Model.from_response_json(
+            {"count": len(items), "items": items}
+        )
+        for model_meta in models_meta:
+            if model_meta.version in seen_versions:
+                continue
+            seen_versions.add(model_meta.version)
+            model_meta.shared_registry_project_name = shared_registry_project_name
+            yield model_meta
+
     def delete(self, model_instance):
         """Delete the model and metadata.
 
@@ -139,15 +257,11 @@ class ModelApi:
         :type model_instance: Model
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.id,
-        ]
+        path_params = self._models_path(
+            _client, model_instance.model_registry_id, model_instance.id
+        )
         _client._send_request("DELETE", path_params)
+        self.invalidate(model_instance)
 
     def set_tag(self, model_instance, name, value: Union[str, dict]):
         """Attach a name/value tag to a model.
@@ -163,19 +277,13 @@ class ModelApi:
         :type value: str or dict
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.id,
-            "tags",
-            name,
-        ]
+        path_params = self._models_path(
+            _client, model_instance.model_registry_id, model_instance.id, "tags", name
+        )
         headers = {"content-type": "application/json"}
-        json_value = json.dumps(value)
+        json_value = util.json_dumps_bytes(value)
         _client._send_request("PUT", path_params, headers=headers, data=json_value)
+        self.invalidate(model_instance)
 
     def delete_tag(self, model_instance, name):
         """Delete a tag.
@@ -188,17 +296,11 @@ class ModelApi:
         :type name: str
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.id,
-            "tags",
-            name,
-        ]
+        path_params = self._models_path(
+            _client, model_instance.model_registry_id, model_instance.id, "tags", name
+        )
         _client._send_request("DELETE", path_params)
+        self.invalidate(model_instance)
 
     @decorators.catch_not_found("hopsworks_common.tag.Tag", fallback_return={})
     def get_tags(self, model_instance):
@@ -214,21 +316,44 @@ class ModelApi:
         :rtype: dict
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
+        cache_key = (
+            "tags",
             _client._project_id,
-            "modelregistries",
             str(model_instance.model_registry_id),
-            "models",
             model_instance.id,
-            "tags",
-        ]
-        return {
-            tag._name: json.loads(tag._value)
-            for tag in tag.Tag.from_response_json(
-                _client._send_request("GET", path_params)
+        )
+        tags_json = self._cache_get(cache_key)
+        if tags_json is None:
+            path_params = self._models_path(
+                _client, model_instance.model_registry_id, model_instance.id, "tags"
             )
-        }
+            tags_json = _client._send_request("GET", path_params)
+            self._cache_set(cache_key, tags_json)
+        return _tags_to_dict(tags_json)
+
+    def get_tags_bulk(self, model_instances, max_workers: int = 8):
+        """Get the tags of several models.
+
+        The model registry has no endpoint returning the tags of many models at once,
+        so the tags of the models are requested concurrently.
+
+        ```python
+        for m, tags in zip(models, model_api.get_tags_bulk(models)):
+            ...
+        ```
+
+        :param model_instances: model instances to get the tags from
+        :type model_instances: List[Model]
+        :param max_workers: maximum number of concurrent requests
+        :type max_workers: int
+        :return: dicts of tag name/values, in the order of the models
+        :rtype: List[dict]
+        """
+        model_instances = list(model_instances)
+        if len(model_instances) <= 1:
+            return [self.get_tags(model_instance) for model_instance in model_instances]
+        with ThreadPoolExecutor(min(max_workers, len(model_instances))) as executor:
+            return list(executor.map(self.get_tags, model_instances))
 
     @decorators.catch_not_found("hopsworks_common.tag.Tag", fallback_return=None)
     def get_tag(self, model_instance, name: str):
@@ -244,16 +369,9 @@ class ModelApi:
         :rtype: dict
         """
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.id,
-            "tags",
-            name,
-        ]
+        path_params = self._models_path(
+            _client, model_instance.model_registry_id, model_instance.id, "tags", name
+        )
 
         return tag.Tag.from_response_json(_client._send_request("GET", path_params))[
             name
@@ -273,30 +391,10 @@ class ModelApi:
         # Raises
             `hopsworks.client.exceptions.RestAPIError`.
         """
-        _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
-            model_instance.id,
-            "provenance",
-            "links",
-        ]
-        query_params = {
-            "expand": "provenance_artifacts",
-            "upstreamLvls": 2,
-            "downstreamLvls": 0,
-        }
-        links_json = _client._send_request("GET", path_params, query_params)
-        links = explicit_provenance.Links.from_response_json(
-            links_json,
-            explicit_provenance.Links.Direction.UPSTREAM,
-            explicit_provenance.Links.Type.FEATURE_VIEW,
+        links_json = self._get_provenance_links(model_instance, upstream_levels=2)
+        return self._parse_provenance_links(
+            links_json, explicit_provenance.Links.Type.FEATURE_VIEW
         )
-        if not links.is_empty():
-            return links
 
     def get_training_dataset_provenance(self, model_instance):
         """Get the parent training dataset of this model, based on explicit provenance.
@@ -312,27 +410,195 @@ class ModelApi:
         # Raises
             `hopsworks.client.exceptions.RestAPIError`.
         """
+        links_json = self._get_provenance_links(model_instance, upstream_levels=1)
+        return self._parse_provenance_links(
+            links_json, explicit_provenance.Links.Type.TRAINING_DATASET
+        )
+
+    def get_provenance(self, model_instance):
+        """Get both the parent feature view and training dataset of this model with a single request.
+
+        # Arguments
+            model_instance: Metadata object of model.
+
+        # Returns
+            `Tuple[Links, Links]`: the feature view and the training dataset used to generate this model,
+                each of them `None` if it does not exist.
+
+        # Raises
+            `hopsworks.client.exceptions.RestAPIError`.
+        """
+        # two upstream levels include both the training dataset and its feature view
+        links_json = self._get_provenance_links(model_instance, upstream_levels=2)
+        return (
+            self._parse_provenance_links(
+                links_json, explicit_provenance.Links.Type.FEATURE_VIEW
+            ),
+            self._parse_provenance_links(
+                links_json, explicit_provenance.Links.Type.TRAINING_DATASET
+            ),
+        )
+
+    async def aget(
+        self, name, version, model_registry_id, shared_registry_project_name=None
+    ):
+        """Asynchronous variant of `get`, see `get` for the arguments.
+
+        Concurrent calls, e.g. with `asyncio.gather`, share the pooled connections
+        of the REST client.
+        """
+        return await self._run_async(
+            self.get, name, version, model_registry_id, shared_registry_project_name
+        )
+
+    async def aget_models(
+        self,
+        name,
+        model_registry_id,
+        shared_registry_project_name=None,
+        metric=None,
+        direction=None,
+    ):
+        """Asynchronous variant of `get_models`, see `get_models` for the arguments."""
+        return await self._run_async(
+            self.get_models,
+            name,
+            model_registry_id,
+            shared_registry_project_name=shared_registry_project_name,
+            metric=metric,
+            direction=direction,
+        )
+
+    async def aget_tags(self, model_instance):
+        """Asynchronous variant of `get_tags`, see `get_tags` for the arguments."""
+        return await self._run_async(self.get_tags, model_instance)
+
+    @staticmethod
+    async def _run_async(func, *args, **kwargs):
+        # the REST client is synchronous, so requests run in the default executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+    def _models_path(self, _client, model_registry_id, *path_params) -> List:
+        return [
+            *_models_base_path(_client._project_id, model_registry_id),
+            *path_params,
+        ]
+
+    @classmethod
+    def invalidate(cls, model_instance=None):
+        """Evict the cached metadata and tags of a model.
+
+        :param model_instance: metadata object of the model to evict, all cached
+            entries are evicted if not provided
+        :type model_instance: Model
+        """
+        if model_instance is None:
+            with cls._etag_lock:
+                cls._etag_cache.clear()
+        with cls._cache_lock:
+            if model_instance is None:
+                cls._cache.clear()
+                return
+            model_registry_id = str(model_instance.model_registry_id)
+            for key in list(cls._cache):
+                if key[2] != model_registry_id:
+                    continue
+                if key[0] == "tags":
+                    if key[3] == model_instance.id:
+                        del cls._cache[key]
+                elif key[3] == model_instance.name:
+                    del cls._cache[key]
+
+    @classmethod
+    def _cache_get(cls, key: tuple) -> Optional[Any]:
+        if cls.CACHE_TTL <= 0:
+            return None
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if expiry <= time.monotonic():
+                del cls._cache[key]
+                return None
+            cls._cache.move_to_end(key)
+            return value
+
+    @classmethod
+    def _cache_set(cls, key: tuple, value: Any) -> None:
+        if cls.CACHE_TTL <= 0:
+            return
+        with cls._cache_lock:
+            cls._cache[key] = (time.monotonic() + cls.CACHE_TTL, value)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_MAXSIZE:
+                cls._cache.popitem(last=False)
+
+    def _get_provenance_links(self, model_instance, upstream_levels):
         _client = client.get_instance()
-        path_params = [
-            "project",
-            _client._project_id,
-            "modelregistries",
-            str(model_instance.model_registry_id),
-            "models",
+        path_params = self._models_path(
+            _client,
+            model_instance.model_registry_id,
             model_instance.id,
             "provenance",
             "links",
-        ]
+        )
         query_params = {
             "expand": "provenance_artifacts",
-            "upstreamLvls": 1,
+            "upstreamLvls": upstream_levels,
             "downstreamLvls": 0,
         }
-        links_json = _client._send_request("GET", path_params, query_params)
+        return self._get_json(_client, path_params, query_params)
+
+    def _get_json(self, _client, path_params, query_params):
+        # Conditional GET, the server can answer 304 Not Modified to a known ETag
+        # in which case the json of the previous response is reused
+        key = (
+            tuple(path_params),
+            query_params
+            if isinstance(query_params, str)
+            else tuple((k, str(v)) for k, v in sorted(query_params.items())),
+        )
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached is not None else None
+
+        response = _client._send_request_raw(
+            "GET", path_params, query_params, headers=headers
+        )
+        if response.status_code == 304 and cached is not None:
+            with self._etag_lock:
+                if key in self._etag_cache:
+                    self._etag_cache.move_to_end(key)
+            return cached[1]
+        if response.status_code // 100 != 2:
+            raise client.exceptions.RestAPIError(
+                _client._get_url(path_params), response
+            )
+
+        response_json = response.json() if len(response.content) > 0 else None
+        etag = response.headers.get("ETag")
+        with self._etag_lock:
+            if etag is None:
+                self._etag_cache.pop(key, None)
+            else:
+                self._etag_cache[key] = (etag, response_json)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > self.CACHE_MAXSIZE:
+                    self._etag_cache.popitem(last=False)
+        return response_json
+
+    def _parse_provenance_links(self, links_json, artifact_type):
+        # most models have no upstream artifacts, skip building empty links for them
+        if not links_json or not links_json.get("upstream"):
+            return None
+
         links = explicit_provenance.Links.from_response_json(
             links_json,
             explicit_provenance.Links.Direction.UPSTREAM,
-            explicit_provenance.Links.Type.TRAINING_DATASET,
+            artifact_type,
         )
-        if not links.is_empty():
-            return links
+        if links.is_empty():
+            return None
+        return links
@@ -586,3 +586,14 @@ class ModelEngine:
             `Links`:  the training dataset used to generate this model
         """
         return self._model_api.get_training_dataset_provenance(model_instance)
+
+    def get_provenance(self, model_instance):
+        """Get the parent feature view and training dataset of this model with a single request.
+
+        # Arguments
+            model_instance: Metadata object of model.
+
+        # Returns
+            `Tuple[Links, Links]`: the feature view and the training dataset used to generate this model
+        """
+        return self._model_api.get_provenance(model_instance)
@@ -342,12 +342,15 @@ class Model:
         # Raises
             `hopsworks.client.exceptions.RestAPIError`: in case the backend fails to retrieve the feature view.
         """
-        fv_prov = self.get_feature_view_provenance()
+        if init:
+            # the training dataset is needed as well, fetch both in a single request
+            fv_prov, td_prov = self._model_engine.get_provenance(model_instance=self)
+        else:
+            fv_prov = self.get_feature_view_provenance()
         fv = explicit_provenance.Links.get_one_accessible_parent(fv_prov)
         if fv is None:
             return None
         if init:
-            td_prov = self.get_training_dataset_provenance()
             td = explicit_provenance.Links.get_one_accessible_parent(td_prov)
             is_deployment = "DEPLOYMENT_NAME" in os.environ
             if online or is_deployment:
@@ -410,9 +413,12 @@ class Model:
     def json(self):
         return json.dumps(self, cls=util.Encoder)
 
+    def json_bytes(self):
+        return util.json_dumps_bytes(self)
+
     def to_dict(self):
         return {
-            "id": self._name + "_" + str(self._version),
+            "id": f"{self._name}_{self._version}",
             "projectName": self._project_name,
             "name": self._name,
             "modelSchema": self._model_schema,
@@ -118,6 +118,21 @@ class TestBaseClient:
         # Assert
         assert spy_retry_token_expired.call_count == 5
 
+    def test_create_session_pool(self):
+        # Arrange
+        client = Client()
+
+        # Act
+        session = client._create_session()
+
+        # Assert
+        for prefix in ["https://", "http://"]:
+            adapter = session.get_adapter(prefix + "hopsworks.ai")
+            assert adapter._pool_connections == Client.REST_POOL_CONNECTIONS
+            assert adapter._pool_maxsize == Client.REST_POOL_MAXSIZE
+            assert adapter.max_retries.total == Client.REST_MAX_RETRIES
+            assert "POST" not in adapter.max_retries.allowed_methods
+
     def _init_test_client(self):
         client = Client()
         client._connected = True
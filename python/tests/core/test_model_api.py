@@ -0,0 +1,530 @@
+#
+#   Copyright 2024 Hopsworks AB
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import pytest
+from hsml.core import explicit_provenance, model_api
+
+
+def _make_response(mocker, json_body, status_code=200, etag=None):
+    response = mocker.MagicMock(status_code=status_code)
+    response.content = json.dumps(json_body).encode() if json_body is not None else b""
+    response.json.return_value = json_body
+    response.headers = {"ETag": etag} if etag is not None else {}
+    return response
+
+
+class TestModelApi:
+    @pytest.fixture(autouse=True)
+    def setup_mocks(self, mocker):
+        self.mock_client = mocker.patch("hsml.client.get_instance").return_value
+        self.mock_client._project_id = 119
+        self.mock_client._send_request_raw.return_value = _make_response(mocker, {})
+        self.model = mocker.MagicMock(model_registry_id=119, id="model_1")
+        self.model.name = "model"
+        model_api.ModelApi.invalidate()
+        yield
+        model_api.ModelApi.invalidate()
+
+    def test_get_provenance(self, mocker):
+        # Arrange
+        mock_links = mocker.patch(
+            "hsml.core.explicit_provenance.Links.from_response_json"
+        )
+        mock_links.return_value.is_empty.return_value = False
+        self.mock_client._send_request_raw.return_value = _make_response(
+            mocker, {"upstream": [{"node": {"artifact_type": "TRAINING_DATASET"}}]}
+        )
+
+        # Act
+        fv_links, td_links = model_api.ModelApi().get_provenance(self.model)
+
+        # Assert
+        assert fv_links is mock_links.return_value
+        assert td_links is mock_links.return_value
+        assert self.mock_client._send_request_raw.call_count == 1
+        assert self.mock_client._send_request_raw.call_args[0][2]["upstreamLvls"] == 2
+        assert [call[0][2] for call in mock_links.call_args_list] == [
+            explicit_provenance.Links.Type.FEATURE_VIEW,
+            explicit_provenance.Links.Type.TRAINING_DATASET,
+        ]
+
+    def test_get_provenance_empty(self, mocker):
+        # Arrange
+        mock_links = mocker.patch(
+            "hsml.core.explicit_provenance.Links.from_response_json"
+        )
+        mock_links.return_value.is_empty.return_value = True
+        self.mock_client._send_request_raw.return_value = _make_response(
+            mocker, {"upstream": [{"node": {"artifact_type": "TRAINING_DATASET"}}]}
+        )
+
+        # Act
+        fv_links, td_links = model_api.ModelApi().get_provenance(self.model)
+
+        # Assert
+        assert fv_links is None
+        assert td_links is None
+
+    def test_get_provenance_no_upstream(self, mocker):
+        # Arrange
+        mock_links = mocker.patch(
+            "hsml.core.explicit_provenance.Links.from_response_json"
+        )
+        self.mock_client._send_request_raw.return_value = _make_response(
+            mocker, {"upstream": [], "downstream": []}
+        )
+
+        # Act
+        fv_links, td_links = model_api.ModelApi().get_provenance(self.model)
+        links = model_api.ModelApi().get_feature_view_provenance(self.model)
+
+        # Assert
+        assert fv_links is None
+        assert td_links is None
+        assert links is None
+        mock_links.assert_not_called()
+
+    def test_get_cache_disabled(self, mocker):
+        # Arrange
+        mocker.patch("hsml.model.Model.from_response_json")
+
+        # Act
+        model_api.ModelApi().get("model", 1, 119)
+        model_api.ModelApi().get("model", 1, 119)
+
+        # Assert
+        assert self.mock_client._send_request_raw.call_count == 2
+
+    def test_get_cached(self, mocker):
+        # Arrange
+        mocker.patch.object(model_api.ModelApi, "CACHE_TTL", 60)
+        mock_from_response_json = mocker.patch(
+            "hsml.model.Model.from_response_json",
+            side_effect=lambda json_dict: mocker.MagicMock(),
+        )
+
+        # Act
+        first = model_api.ModelApi().get("model", 1, 119)
+        second = model_api.ModelApi().get("model", 1, 119)
+        model_api.ModelApi().get("model", 2, 119)
+
+        # Assert
+        assert first is not second
+        assert mock_from_response_json.call_count == 3
+        assert self.mock_client._send_request_raw.call_count == 2
+
+    def test_get_cache_expired(self, mocker):
+        # Arrange
+        mocker.patch.object(model_api.ModelApi, "CACHE_TTL", 60)
+        mocker.patch("hsml.model.Model.from_response_json")
+        mock_monotonic = mocker.patch("time.monotonic", return_value=0)
+
+        # Act
+        model_api.ModelApi().get("model", 1, 119)
+        mock_monotonic.return_value = 61
+        model_api.ModelApi().get("model", 1, 119)
+
+        # Assert
+        assert self.mock_client._send_request_raw.call_count == 2
+
+    def test_get_cache_maxsize(self, mocker):
+        # Arrange
+        mocker.patch.object(model_api.ModelApi, "CACHE_TTL", 60)
+        mocker.patch.object(model_api.ModelApi, "CACHE_MAXSIZE", 1)
+        mocker.patch("hsml.model.Model.from_response_json")
+
+        # Act
+        model_api.ModelApi().get("model", 1, 119)
+        model_api.ModelApi().get("model", 2, 119)
+        model_api.ModelApi().get("model", 1, 119)
+
+        # Assert
+        assert self.mock_client._send_request_raw.call_count == 3
+
+    def test_get_not_modified(self, mocker):
+        # Arrange
+        mock_from_response_json = mocker.patch("hsml.model.Model.from_response_json")
+        self.mock_client._send_request_raw.side_effect = [
+            _make_response(mocker, {"name": "model"}, etag='"v1"'),
+            _make_response(mocker, None, status_code=304, etag='"v1"'),
+        ]
+        api = model_api.ModelApi()
+
+        # Act
+        api.get("model", 1, 119)
+        api.get("model", 1, 119)
+
+        # Assert
+        calls = self.mock_client._send_request_raw.call_args_list
+        assert calls[0][1]["headers"] is None
+        assert calls[1][1]["headers"] == {"If-None-Match": '"v1"'}
+        assert [call[0][0] for call in mock_from_response_json.call_args_list] == [
+            {"name": "model"},
+            {"name": "model"},
+        ]
+
+    def test_get_not_modified_shared_between_instances(self, mocker):
+        # Arrange
+        mocker.patch("hsml.model.Model.from_response_json")
+        self.mock_client._send_request_raw.side_effect = [
+            _make_response(mocker, {"name": "model"}, etag='"v1"'),
+            _make_response(mocker, None, status_code=304, etag='"v1"'),
+        ]
+
+        # Act
+        model_api.ModelApi().get("model", 1, 119)
+        model_api.ModelApi().get("model", 1, 119)
+
+        # Assert
+        calls = self.mock_client._send_request_raw.call_args_list
+        assert calls[1][1]["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_get_models_error(self, mocker):
+        # Arrange
+        self.mock_client._send_request_raw.return_value = _make_response(
+            mocker, {"errorCode": 160000}, status_code=500
+        )
+
+        # Act
+        with pytest.raises(model_api.client.exceptions.RestAPIError):
+            model_api.ModelApi().get_models("model", 119)
+
+    def test_get_tags_invalidated_by_set_tag(self, mocker):
+        # Arrange
+        mocker.patch.object(model_api.ModelApi, "CACHE_TTL", 60)
+        self.mock_client._send_request.return_value = {
+            "count": 1,
+            "items": [{"name": "tag", "value": '"value"'}],
+        }
+
+        # Act
+        api = model_api.ModelApi()
+        first = api.get_tags(self.model)
+        second = api.get_tags(self.model)
+        api.set_tag(self.model, "tag", "new_value")
+        third = api.get_tags(self.model)
+
+        # Assert
+        assert first == second == third == {"tag": "value"}
+        assert [
+            call[0][0] for call in self.mock_client._send_request.call_args_list
+        ] == [
+            "GET",
+            "PUT",
+            "GET",
+        ]
+
+    def test_get_tags_cached_not_shared(self, mocker):
+        # Arrange
+        mocker.patch.object(model_api.ModelApi, "CACHE_TTL", 60)
+        self.mock_client._send_request.return_value = {
+            "count": 1,
+            "items": [{"name": "tag", "value": '{"key": "value"}'}],
+        }
+
+        # Act
+        first = model_api.ModelApi().get_tags(self.model)
+        first["tag"]["key"] = "changed"
+        second = model_api.ModelApi().get_tags(self.model)
+
+        # Assert
+        assert second == {"tag": {"key": "value"}}
+        assert self.mock_client._send_request.call_count == 1
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_get_tags(self, mocker, has_orjson):
+        # Arrange
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", has_orjson)
+        tags_json = {
+            "type": "tagsDTO",
+            "count": 3,
+            "items": [
+                {"name": "str_tag", "value": '"value"'},
+                {"name": "camelCaseTag", "value": '{"someKey": [1, 2]}'},
+                {"name": "parsed_tag", "value": {"key": "value"}},
+            ],
+        }
+        self.mock_client._send_request.return_value = tags_json
+
+        # Act
+        tags = model_api.ModelApi().get_tags(self.model)
+
+        # Assert
+        assert tags == {
+            "str_tag": "value",
+            "camelCaseTag": {"someKey": [1, 2]},
+            "parsed_tag": {"key": "value"},
+        }
+
+    def test_get_tags_empty(self):
+        # Arrange
+        self.mock_client._send_request.return_value = {"count": 0}
+
+        # Act
+        tags = model_api.ModelApi().get_tags(self.model)
+
+        # Assert
+        assert tags == {}
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_set_tag(self, mocker, has_orjson):
+        # Arrange
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", has_orjson)
+        value = {"key": ["value", 1.5], "nested": {"flag": True}}
+
+        # Act
+        model_api.ModelApi().set_tag(self.model, "tag", value)
+
+        # Assert
+        data = self.mock_client._send_request.call_args[1]["data"]
+        assert isinstance(data, bytes)
+        assert json.loads(data) == value
+
+    def test_put(self):
+        # Arrange
+        self.model.version = 1
+
+        # Act
+        model_api.ModelApi().put(self.model, None)
+
+        # Assert
+        call = self.mock_client._send_request.call_args
+        assert call[0][1][-1] == "model_1"
+        assert call[1]["data"] is self.model.json_bytes.return_value
+
+    def test_put_after_set_model_version(self, mocker):
+        # Arrange
+        from hsml import model
+        from hsml.engine import model_engine
+
+        m = model.Model(id=None, name="mnist", version=None, model_registry_id=119)
+        engine = model_engine.ModelEngine()
+        mocker.patch.object(
+            engine._dataset_api,
+            "list",
+            side_effect=[
+                {"items": [{"attributes": {"path": "/Models/mnist/2"}}]},
+                {"items": []},
+            ],
+        )
+        mocker.patch("hsml.core.model_api.ModelApi.get", return_value=None)
+        self.mock_client._send_request.return_value = {}
+        mocker.patch("hsml.model.Model.update_from_response_json")
+
+        # Act
+        engine._set_model_version(m, "/Models", "/Models/mnist")
+        model_api.ModelApi().put(m, None)
+
+        # Assert
+        call = self.mock_client._send_request.call_args
+        assert call[0][1][-1] == "mnist_3"
+        assert json.loads(call[1]["data"])["id"] == "mnist_3"
+
+    def test_models_path(self):
+        # Act
+        api = model_api.ModelApi()
+        api.delete_tag(self.model, "tag")
+        self.mock_client._project_id = 120
+        api.delete(self.model)
+
+        # Assert
+        assert [
+            call[0][1] for call in self.mock_client._send_request.call_args_list
+        ] == [
+            [
+                "project",
+                119,
+                "modelregistries",
+                "119",
+                "models",
+                "model_1",
+                "tags",
+                "tag",
+            ],
+            ["project", 120, "modelregistries", "119", "models", "model_1"],
+        ]
+
+    def test_aget_tags(self):
+        # Arrange
+        self.mock_client._send_request.return_value = {
+            "count": 1,
+            "items": [{"name": "tag", "value": '"value"'}],
+        }
+        api = model_api.ModelApi()
+
+        async def get_all_tags():
+            return await asyncio.gather(*[api.aget_tags(self.model) for _ in range(3)])
+
+        # Act
+        tags = asyncio.run(get_all_tags())
+
+        # Assert
+        assert tags == [{"tag": "value"}] * 3
+        assert self.mock_client._send_request.call_count == 3
+
+    def test_aget_models(self, mocker):
+        # Arrange
+        mock_get_models = mocker.patch("hsml.core.model_api.ModelApi.get_models")
+
+        # Act
+        models = asyncio.run(
+            model_api.ModelApi().aget_models(
+                "model", 119, metric="acc", direction="max"
+            )
+        )
+
+        # Assert
+        assert models is mock_get_models.return_value
+        mock_get_models.assert_called_once_with(
+            "model",
+            119,
+            shared_registry_project_name=None,
+            metric="acc",
+            direction="max",
+        )
+
+    def test_slots(self):
+        # Act
+        api = model_api.ModelApi()
+
+        # Assert
+        assert not hasattr(api, "__dict__")
+
+    def test_get_tags_bulk(self, mocker):
+        # Arrange
+        models = [
+            mocker.MagicMock(model_registry_id=119, id=f"model_{i}") for i in range(5)
+        ]
+
+        def send_request(method, path_params):
+            return {
+                "count": 1,
+                "items": [{"name": "model", "value": f'"{path_params[-2]}"'}],
+            }
+
+        self.mock_client._send_request.side_effect = send_request
+
+        # Act
+        tags = model_api.ModelApi().get_tags_bulk(models)
+
+        # Assert
+        assert tags == [{"model": f"model_{i}"} for i in range(5)]
+
+    def test_get_tags_bulk_empty(self):
+        # Act
+        tags = model_api.ModelApi().get_tags_bulk([])
+
+        # Assert
+        assert tags == []
+        assert self.mock_client._send_request.call_count == 0
+
+    def test_iter_models(self, mocker):
+        # Arrange
+        mocker.patch(
+            "hsml.model.Model.from_response_json",
+            side_effect=lambda json_dict: [
+                mocker.MagicMock(version=item["version"]) for item in json_dict["items"]
+            ],
+        )
+        versions = list(range(1, 6))
+
+        def send_request(method, path_params, query_params):
+            params = parse_qs(query_params)
+            offset, limit = int(params["offset"][0]), int(params["limit"][0])
+            return {
+                "count": len(versions),
+                "items": [{"version": v} for v in versions[offset : offset + limit]],
+            }
+
+        self.mock_client._send_request.side_effect = send_request
+
+        # Act
+        models = model_api.ModelApi().iter_models("model", 119, page_size=2)
+
+        # Assert
+        assert [m.version for m in models] == versions
+        params = [
+            parse_qs(call[0][2])
+            for call in self.mock_client._send_request.call_args_list
+        ]
+        assert [p["offset"] for p in params] == [["0"], ["2"], ["4"]]
+        assert all(p["filter_by"] == ["name_eq:model"] for p in params)
+        self.mock_client._send_request_raw.assert_not_called()
+
+    def test_iter_models_unstable_order(self, mocker):
+        # Arrange
+        mocker.patch(
+            "hsml.model.Model.from_response_json",
+            side_effect=lambda json_dict: [
+                mocker.MagicMock(version=item["version"]) for item in json_dict["items"]
+            ],
+        )
+        pages = [[1, 2], [2, 3], [5]]
+
+        def send_request(method, path_params, query_params):
+            return {"count": 5, "items": [{"version": v} for v in pages.pop(0)]}
+
+        self.mock_client._send_request.side_effect = send_request
+        self.mock_client._send_request_raw.return_value = _make_response(
+            mocker,
+            {"count": 5, "items": [{"version": v} for v in [5, 4, 3, 2, 1]]},
+        )
+
+        # Act
+        models = model_api.ModelApi().iter_models("model", 119, page_size=2)
+
+        # Assert
+        assert [m.version for m in models] == [1, 2, 3, 5, 4]
+        assert "offset" not in parse_qs(
+            self.mock_client._send_request_raw.call_args[0][2]
+        )
+
+    def test_iter_models_without_count(self, mocker):
+        # Arrange
+        mocker.patch(
+            "hsml.model.Model.from_response_json",
+            side_effect=lambda json_dict: [
+                mocker.MagicMock(version=item["version"]) for item in json_dict["items"]
+            ],
+        )
+        self.mock_client._send_request.return_value = {"items": [{"version": 1}]}
+
+        # Act
+        models = model_api.ModelApi().iter_models("model", 119, page_size=2)
+
+        # Assert
+        assert [m.version for m in models] == [1]
+        self.mock_client._send_request_raw.assert_not_called()
+
+    def test_get_models_query_params(self, mocker):
+        # Arrange
+        mocker.patch("hsml.model.Model.from_response_json", return_value=[])
+
+        # Act
+        model_api.ModelApi().get_models("my model", 119)
+        model_api.ModelApi().get_models("my model", 119, metric="acc", direction="max")
+
+        # Assert
+        assert [
+            call[0][2] for call in self.mock_client._send_request_raw.call_args_list
+        ] == [
+            "expand=trainingdatasets&filter_by=name_eq%3Amy+model",
+            "expand=trainingdatasets&filter_by=name_eq%3Amy+model"
+            "&sort_by=acc%3Adesc&limit=1",
+        ]
@@ -0,0 +1,266 @@
+#
+#   Copyright 2024 Hopsworks AB
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from hopsworks_common import client
+from hopsworks_common.core.opensearch_api import OPENSEARCH_CONFIG, OpenSearchApi
+
+
+def _make_jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode()
+    return "Bearer header." + payload.rstrip("=") + ".signature"
+
+
+class TestOpenSearchApi:
+    @pytest.fixture(autouse=True)
+    def setup_mocks(self, mocker):
+        mocker.patch("hopsworks_common.core.opensearch_api.VariableApi")
+        self.mock_client = mocker.patch(
+            "hopsworks_common.client.get_instance"
+        ).return_value
+        self.mock_client._project_id = "119"
+        OpenSearchApi._invalidate_authorization_token()
+        yield
+        OpenSearchApi._invalidate_authorization_token()
+
+    def test_get_token_expiry(self):
+        assert OpenSearchApi._get_token_expiry(_make_jwt(1234)) == 1234
+
+    def test_get_token_expiry_invalid_token(self):
+        assert OpenSearchApi._get_token_expiry("not-a-jwt") is None
+
+    def test_get_authorization_token_cached(self):
+        # Arrange
+        token = _make_jwt(time.time() + 3600)
+        self.mock_client._send_request.return_value = {"token": token}
+
+        # Act
+        first = OpenSearchApi()._get_authorization_token()
+        second = OpenSearchApi()._get_authorization_token()
+
+        # Assert
+        assert first == token
+        assert second == token
+        assert self.mock_client._send_request.call_count == 1
+
+    def test_get_authorization_token_expired(self):
+        # Arrange
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + OpenSearchApi.TOKEN_EXPIRY_LEEWAY - 1)
+        }
+
+        # Act
+        OpenSearchApi()._get_authorization_token()
+        OpenSearchApi()._get_authorization_token()
+
+        # Assert
+        assert self.mock_client._send_request.call_count == 2
+
+    def test_get_authorization_token_invalidated(self):
+        # Arrange
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+
+        # Act
+        OpenSearchApi()._get_authorization_token()
+        OpenSearchApi._invalidate_authorization_token("119")
+        OpenSearchApi()._get_authorization_token()
+
+        # Assert
+        assert self.mock_client._send_request.call_count == 2
+
+    def test_get_authorization_token_per_cluster(self):
+        # Arrange
+        self.mock_client._send_request.side_effect = [
+            {"token": _make_jwt(time.time() + 3600)},
+            {"token": _make_jwt(time.time() + 7200)},
+        ]
+
+        # Act
+        self.mock_client._base_url = "https://cluster-a"
+        first = OpenSearchApi()._get_authorization_token()
+        self.mock_client._base_url = "https://cluster-b"
+        second = OpenSearchApi()._get_authorization_token()
+
+        # Assert
+        assert first != second
+        assert self.mock_client._send_request.call_count == 2
+
+    def test_get_authorization_token_client_stopped(self, mocker):
+        # Arrange
+        mocker.patch("hopsworks_common.client._client", None)
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+
+        # Act
+        OpenSearchApi()._get_authorization_token()
+        client.stop()
+        OpenSearchApi()._get_authorization_token()
+
+        # Assert
+        assert self.mock_client._send_request.call_count == 2
+
+    def test_get_default_py_config_pool_maxsize(self, mocker):
+        # Arrange
+        mocker.patch(
+            "hopsworks_common.core.opensearch_api.OpenSearchApi._get_opensearch_url",
+            return_value="https://rest.elastic.service.consul:9200",
+        )
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+
+        # Act
+        default_config = OpenSearchApi().get_default_py_config()
+        config = OpenSearchApi().get_default_py_config(pool_maxsize=100)
+
+        # Assert
+        assert default_config[OPENSEARCH_CONFIG.POOL_MAXSIZE] == 32
+        assert config[OPENSEARCH_CONFIG.POOL_MAXSIZE] == 100
+        assert config[OPENSEARCH_CONFIG.HOSTS] == [
+            {"host": "rest.elastic.service.consul", "port": 9200}
+        ]
+
+    def test_get_client_reused(self, mocker):
+        # Arrange
+        mock_opensearch = mocker.patch("opensearchpy.OpenSearch")
+        mocker.patch(
+            "hopsworks_common.core.opensearch_api.OpenSearchApi._get_opensearch_url",
+            return_value="https://rest.elastic.service.consul:9200",
+        )
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        first = opensearch_api.get_client()
+        second = opensearch_api.get_client()
+
+        # Assert
+        assert first is second
+        assert mock_opensearch.call_count == 1
+
+    def test_get_client_token_rotated(self, mocker):
+        # Arrange
+        mock_opensearch = mocker.patch("opensearchpy.OpenSearch")
+        mocker.patch(
+            "hopsworks_common.core.opensearch_api.OpenSearchApi._get_opensearch_url",
+            return_value="https://rest.elastic.service.consul:9200",
+        )
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        opensearch_api.get_client()
+        OpenSearchApi._invalidate_authorization_token()
+        rotated_token = _make_jwt(time.time() + 7200)
+        self.mock_client._send_request.return_value = {"token": rotated_token}
+        opensearch_api.get_client()
+
+        # Assert
+        assert mock_opensearch.call_count == 2
+        assert self.mock_client._send_request.call_count == 2
+        assert mock_opensearch.call_args[1][OPENSEARCH_CONFIG.HEADERS] == {
+            "Authorization": rotated_token
+        }
+        mock_opensearch.return_value.close.assert_called_once()
+
+    def test_get_client_token_without_expiry(self, mocker):
+        # Arrange
+        mock_opensearch = mocker.patch("opensearchpy.OpenSearch")
+        mocker.patch(
+            "hopsworks_common.core.opensearch_api.OpenSearchApi._get_opensearch_url",
+            return_value="https://rest.elastic.service.consul:9200",
+        )
+        self.mock_client._send_request.return_value = {"token": "not-a-jwt"}
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        first = opensearch_api.get_client()
+        second = opensearch_api.get_client()
+        third = opensearch_api.get_client()
+
+        # Assert
+        assert first is second is third
+        assert mock_opensearch.call_count == 1
+        assert self.mock_client._send_request.call_count == 1
+        mock_opensearch.return_value.close.assert_not_called()
+
+    def test_get_client_concurrent(self, mocker):
+        # Arrange
+        mock_opensearch = mocker.patch("opensearchpy.OpenSearch")
+        mocker.patch(
+            "hopsworks_common.core.opensearch_api.OpenSearchApi._get_opensearch_url",
+            return_value="https://rest.elastic.service.consul:9200",
+        )
+        self.mock_client._send_request.return_value = {
+            "token": _make_jwt(time.time() + 3600)
+        }
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        with ThreadPoolExecutor(8) as executor:
+            clients = list(
+                executor.map(lambda _: opensearch_api.get_client(), range(8))
+            )
+
+        # Assert
+        assert all(c is clients[0] for c in clients)
+        assert mock_opensearch.call_count == 1
+
+    def test_get_project_index(self):
+        # Arrange
+        self.mock_client._project_name = "Test_Project"
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        lower_index = opensearch_api.get_project_index("index")
+        mixed_index = opensearch_api.get_project_index("My_Index")
+        self.mock_client._project_name = "other"
+        other_index = opensearch_api.get_project_index("index")
+
+        # Assert
+        assert lower_index == "test_project_index"
+        assert mixed_index == "test_project_my_index"
+        assert other_index == "other_index"
+
+    def test_get_opensearch_url_cached(self, mocker):
+        # Arrange
+        mocker.patch("hopsworks_common.client._is_external", return_value=False)
+        mock_variable_api = mocker.patch(
+            "hopsworks_common.core.opensearch_api.VariableApi"
+        ).return_value
+        mock_variable_api.get_service_discovery_domain.return_value = "consul"
+        opensearch_api = OpenSearchApi()
+
+        # Act
+        first = opensearch_api._get_opensearch_url()
+        second = opensearch_api._get_opensearch_url()
+        opensearch_api._invalidate_opensearch_url()
+        third = opensearch_api._get_opensearch_url()
+
+        # Assert
+        assert first == second == third == "https://rest.elastic.service.consul:9200"
+        assert mock_variable_api.get_service_discovery_domain.call_count == 2
@@ -15,6 +15,10 @@
 #
 
 
+import json as pyjson
+
+import humps
+import pytest
 from hsfs import expectation_suite, ge_expectation
 
 
@@ -90,3 +94,199 @@ class TestExpectationSuite:
 
         # Assert
         assert es_list is None
+
+    def test_setters_update_metadata(self, mocker, backend_fixtures):
+        # Arrange
+        mock_es_engine = mocker.patch(
+            "hsfs.core.expectation_suite_engine.ExpectationSuiteEngine"
+        )
+        json = backend_fixtures["expectation_suite"]["get"]["response"]
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+
+        # Act
+        es.run_validation = False
+        es.meta = '{"key": "new_value"}'
+
+        # Assert
+        assert mock_es_engine.return_value.update_metadata.call_count == 2
+        mock_es_engine.return_value.update_metadata.assert_called_with(es)
+        assert es.meta == {"key": "new_value"}
+
+    def test_init_does_not_update_metadata(self, mocker, backend_fixtures):
+        # Arrange
+        mock_es_engine = mocker.patch(
+            "hsfs.core.expectation_suite_engine.ExpectationSuiteEngine"
+        )
+        json = backend_fixtures["expectation_suite"]["get"]["response"]
+
+        # Act
+        expectation_suite.ExpectationSuite.from_response_json(json)
+
+        # Assert
+        assert mock_es_engine.return_value.update_metadata.call_count == 0
+
+    def test_json_without_orjson(self, mocker, backend_fixtures):
+        # Arrange
+        json = backend_fixtures["expectation_suite"]["get_basic_info"]["response"]
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+        orjson_payload = es.json()
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", False)
+
+        # Act
+        json_payload = es.json()
+
+        # Assert
+        expected = pyjson.loads(orjson_payload)
+        actual = pyjson.loads(json_payload)
+        assert pyjson.loads(expected.pop("meta")) == es.meta
+        assert pyjson.loads(actual.pop("meta")) == es.meta
+        assert actual == expected
+
+    def test_expectations_setter(self):
+        # Arrange
+        es = expectation_suite.ExpectationSuite(
+            expectation_suite_name="test_expectation_suite_name",
+            expectations=[],
+            meta={},
+        )
+        expectation = ge_expectation.GeExpectation(
+            expectation_type="expect_column_max_to_be_between",
+            kwargs={"column": "foo"},
+            meta={},
+        )
+
+        # Act
+        es.expectations = [
+            expectation,
+            {
+                "expectation_type": "expect_column_min_to_be_between",
+                "kwargs": {"column": "bar"},
+                "meta": {},
+            },
+        ]
+
+        # Assert
+        assert es.expectations[0] is expectation
+        assert isinstance(es.expectations[1], ge_expectation.GeExpectation)
+        assert es.expectations[1].expectation_type == "expect_column_min_to_be_between"
+
+    def test_expectations_setter_unsupported_type(self):
+        # Arrange
+        es = expectation_suite.ExpectationSuite(
+            expectation_suite_name="test_expectation_suite_name",
+            expectations=[],
+            meta={},
+        )
+
+        # Act
+        with pytest.raises(TypeError):
+            es.expectations = ["expect_column_min_to_be_between"]
+
+    def test_single_expectation_api_updates_local_expectations(
+        self, mocker, backend_fixtures
+    ):
+        # Arrange
+        mock_expectation_engine = mocker.patch(
+            "hsfs.expectation_suite.ExpectationEngine"
+        ).return_value
+        mocker.patch("hsfs.core.expectation_suite_engine.ExpectationSuiteEngine")
+        json = backend_fixtures["expectation_suite"]["get"]["response"]
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+        existing_id = es.expectations[0].id
+        created = ge_expectation.GeExpectation(
+            id=existing_id + 1,
+            expectation_type="expect_column_min_to_be_between",
+            kwargs={"column": "foo"},
+            meta={},
+        )
+        updated = ge_expectation.GeExpectation(
+            id=existing_id,
+            expectation_type="expect_column_max_to_be_between",
+            kwargs={"column": "bar"},
+            meta={},
+        )
+        mock_expectation_engine.create.return_value = created
+        mock_expectation_engine.update.return_value = updated
+
+        # Act
+        es.add_expectation(created, ge_type=False)
+        es.replace_expectation(updated, ge_type=False)
+        es.remove_expectation(expectation_id=created.id)
+
+        # Assert
+        assert es.expectations == [updated]
+        mock_expectation_engine.get_expectations_by_suite_id.assert_not_called()
+
+    def test_add_expectation_refresh(self, mocker, backend_fixtures):
+        # Arrange
+        mock_expectation_engine = mocker.patch(
+            "hsfs.expectation_suite.ExpectationEngine"
+        ).return_value
+        mocker.patch("hsfs.core.expectation_suite_engine.ExpectationSuiteEngine")
+        json = backend_fixtures["expectation_suite"]["get"]["response"]
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+        expectation = ge_expectation.GeExpectation(
+            id=1,
+            expectation_type="expect_column_min_to_be_between",
+            kwargs={"column": "foo"},
+            meta={},
+        )
+        mock_expectation_engine.create.return_value = expectation
+        mock_expectation_engine.get_expectations_by_suite_id.return_value = [
+            expectation
+        ]
+
+        # Act
+        es.add_expectation(expectation, ge_type=False, refresh=True)
+
+        # Assert
+        assert es.expectations == [expectation]
+        mock_expectation_engine.get_expectations_by_suite_id.assert_called_once()
+
+    @pytest.mark.parametrize("fixture", ["get", "get_basic_info"])
+    def test_from_response_json_matches_init(self, backend_fixtures, fixture):
+        # Arrange
+        json = backend_fixtures["expectation_suite"][fixture]["response"]
+
+        # Act
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+        expected = expectation_suite.ExpectationSuite(**humps.decamelize(json))
+
+        # Assert
+        assert es.to_json_dict() == expected.to_json_dict()
+        assert es._href == expected._href
+        assert (es._expectation_engine is None) == (
+            expected._expectation_engine is None
+        )
+
+    def test_decamelize(self):
+        # Arrange
+        json = {
+            "count": 1,
+            "items": [
+                {
+                    "expectationSuiteName": "name",
+                    "geCloudId": None,
+                    "HTTPHeader": "value",
+                    "nested": [{"runValidation": True, "123": 1}],
+                }
+            ],
+        }
+
+        # Act
+        result = expectation_suite._decamelize(json)
+
+        # Assert
+        assert result == humps.decamelize(json)
+
+    def test_no_instance_dict(self, backend_fixtures):
+        # Arrange
+        json = backend_fixtures["expectation_suite"]["get_basic_info"]["response"]
+
+        # Act
+        es = expectation_suite.ExpectationSuite.from_response_json(json)
+
+        # Assert
+        assert not hasattr(es, "__dict__")
+        with pytest.raises(AttributeError):
+            es._unknown_attribute = None
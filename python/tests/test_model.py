@@ -15,9 +15,11 @@
 #
 
 import copy
+import json as pyjson
 import os
 
 import humps
+import pytest
 from hsml import model
 from hsml.constants import MODEL
 from hsml.core import explicit_provenance
@@ -179,6 +181,48 @@ class TestModel:
             upload_configuration=upload_configuration,
         )
 
+    # to dict
+
+    def test_to_dict_id(self, backend_fixtures):
+        # Arrange
+        m_json = backend_fixtures["model"]["get_python"]["response"]["items"][0]
+        m = model.Model.from_response_json(m_json)
+
+        # Act
+        m.version = 7
+        m.name = "renamed"
+
+        # Assert
+        assert m.to_dict()["id"] == "renamed_7"
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_json_bytes(self, mocker, backend_fixtures, has_orjson):
+        # Arrange
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", has_orjson)
+        m_json = backend_fixtures["model"]["get_python"]["response"]["items"][0]
+        m = model.Model.from_response_json(m_json)
+
+        # Act
+        json_bytes = m.json_bytes()
+
+        # Assert
+        assert isinstance(json_bytes, bytes)
+        assert pyjson.loads(json_bytes) == pyjson.loads(m.json())
+
+    def test_json_bytes_uses_orjson(self, mocker, backend_fixtures):
+        # Arrange
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", True)
+        mock_json_dumps = mocker.patch("hopsworks_common.util.json.dumps")
+        m_json = backend_fixtures["model"]["get_python"]["response"]["items"][0]
+        m = model.Model.from_response_json(m_json)
+
+        # Act
+        json_bytes = m.json_bytes()
+
+        # Assert
+        assert pyjson.loads(json_bytes)["id"] == "pythonmodel_0"
+        mock_json_dumps.assert_not_called()
+
     # deploy
 
     def test_deploy(self, mocker, backend_fixtures):
@@ -420,67 +464,72 @@ class TestModel:
     def test_get_feature_view(self, mocker):
         mock_fv = mocker.Mock()
         links = explicit_provenance.Links(accessible=[mock_fv])
-        mock_fv_provenance = mocker.patch(
-            "hsml.model.Model.get_feature_view_provenance", return_value=links
-        )
-        mock_td_provenance = mocker.patch(
-            "hsml.model.Model.get_training_dataset_provenance", return_value=links
+        mock_provenance = mocker.patch(
+            "hsml.engine.model_engine.ModelEngine.get_provenance",
+            return_value=(links, links),
         )
         mocker.patch("os.environ", return_value={})
         m = model.Model(1, "test")
         m.get_feature_view()
-        mock_fv_provenance.assert_called_once()
-        mock_td_provenance.assert_called_once()
+        mock_provenance.assert_called_once()
         assert not mock_fv.init_serving.called
         assert mock_fv.init_batch_scoring.called
 
-    def test_get_feature_view_online(self, mocker):
+    def test_get_feature_view_no_init(self, mocker):
         mock_fv = mocker.Mock()
         links = explicit_provenance.Links(accessible=[mock_fv])
         mock_fv_provenance = mocker.patch(
             "hsml.model.Model.get_feature_view_provenance", return_value=links
         )
-        mock_td_provenance = mocker.patch(
-            "hsml.model.Model.get_training_dataset_provenance", return_value=links
+        mock_provenance = mocker.patch(
+            "hsml.engine.model_engine.ModelEngine.get_provenance"
+        )
+        m = model.Model(1, "test")
+        fv = m.get_feature_view(init=False)
+        assert fv is mock_fv
+        mock_fv_provenance.assert_called_once()
+        assert not mock_provenance.called
+        assert not mock_fv.init_serving.called
+        assert not mock_fv.init_batch_scoring.called
+
+    def test_get_feature_view_online(self, mocker):
+        mock_fv = mocker.Mock()
+        links = explicit_provenance.Links(accessible=[mock_fv])
+        mock_provenance = mocker.patch(
+            "hsml.engine.model_engine.ModelEngine.get_provenance",
+            return_value=(links, links),
         )
         mocker.patch("os.environ", return_value={})
         m = model.Model(1, "test")
         m.get_feature_view(online=True)
-        mock_fv_provenance.assert_called_once()
-        mock_td_provenance.assert_called_once()
+        mock_provenance.assert_called_once()
         assert mock_fv.init_serving.called
         assert not mock_fv.init_batch_scoring.called
 
     def test_get_feature_view_batch(self, mocker):
         mock_fv = mocker.Mock()
         links = explicit_provenance.Links(accessible=[mock_fv])
-        mock_fv_provenance = mocker.patch(
-            "hsml.model.Model.get_feature_view_provenance", return_value=links
-        )
-        mock_td_provenance = mocker.patch(
-            "hsml.model.Model.get_training_dataset_provenance", return_value=links
+        mock_provenance = mocker.patch(
+            "hsml.engine.model_engine.ModelEngine.get_provenance",
+            return_value=(links, links),
         )
         mocker.patch("os.environ", return_value={})
         m = model.Model(1, "test")
         m.get_feature_view(online=False)
-        mock_fv_provenance.assert_called_once()
-        mock_td_provenance.assert_called_once()
+        mock_provenance.assert_called_once()
         assert not mock_fv.init_serving.called
         assert mock_fv.init_batch_scoring.called
 
     def test_get_feature_view_deployment(self, mocker):
         mock_fv = mocker.Mock()
         links = explicit_provenance.Links(accessible=[mock_fv])
-        mock_fv_provenance = mocker.patch(
-            "hsml.model.Model.get_feature_view_provenance", return_value=links
-        )
-        mock_td_provenance = mocker.patch(
-            "hsml.model.Model.get_training_dataset_provenance", return_value=links
+        mock_provenance = mocker.patch(
+            "hsml.engine.model_engine.ModelEngine.get_provenance",
+            return_value=(links, links),
         )
         mocker.patch.dict(os.environ, {"DEPLOYMENT_NAME": "test"})
         m = model.Model(1, "test")
         m.get_feature_view()
-        mock_fv_provenance.assert_called_once()
-        mock_td_provenance.assert_called_once()
+        mock_provenance.assert_called_once()
         assert mock_fv.init_serving.called
         assert not mock_fv.init_batch_scoring.called
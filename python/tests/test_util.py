@@ -15,11 +15,14 @@
 #
 
 import asyncio
+import json as pyjson
+import math
 import os
 from datetime import date, datetime
 from urllib.parse import ParseResult
 
 import hopsworks_common.util
+import numpy as np
 import pytest
 import pytz
 from hopsworks_common import util
@@ -614,6 +617,84 @@ class TestUtil:
 
     # json
 
+    @pytest.mark.parametrize(
+        "meta",
+        [
+            {"note": "x"},
+            {"note": "nullable column", "ge_cloud_id": None},
+            {"nested": {"values": [1, 2.5, True, None], "empty": []}},
+            [{"a": "b"}, ["c", 1]],
+            {"note": np.float64(3.0)},
+            {"note": None, 1: "int key"},
+            {"big": 2**70},
+        ],
+    )
+    def test_json_dumps_without_orjson(self, mocker, meta):
+        # Act
+        orjson_payload = util.json_dumps(meta)
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", False)
+        json_payload = util.json_dumps(meta)
+
+        # Assert
+        assert pyjson.loads(orjson_payload) == pyjson.loads(json_payload)
+
+    @pytest.mark.parametrize(
+        "meta",
+        [
+            {"note": float("nan")},
+            {"nested": [{"value": float("inf")}]},
+        ],
+    )
+    def test_json_dumps_non_finite(self, mocker, meta):
+        # Act
+        orjson_payload = util.json_dumps(meta)
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", False)
+        json_payload = util.json_dumps(meta)
+
+        # Assert
+        assert orjson_payload == json_payload
+
+    def test_json_dumps_non_finite_to_dict(self, mocker):
+        # Arrange
+        obj = {"obj": mocker.MagicMock(to_dict=lambda: {"value": float("-inf")})}
+
+        # Act
+        payload = util.json_dumps(obj)
+
+        # Assert
+        assert payload == '{"obj": {"value": -Infinity}}'
+
+    def test_json_dumps_uses_orjson(self, mocker):
+        # Arrange
+        mock_json_dumps = mocker.patch("hopsworks_common.util.json.dumps")
+
+        # Act
+        payload = util.json_dumps({"note": "nullable column", "ge_cloud_id": None})
+
+        # Assert
+        assert pyjson.loads(payload) == {"note": "nullable column", "ge_cloud_id": None}
+        mock_json_dumps.assert_not_called()
+
+    def test_json_loads_non_finite(self):
+        # Act
+        meta = util.json_loads('{"note": NaN}')
+
+        # Assert
+        assert math.isnan(meta["note"])
+
+    def test_json_dumps_bytes(self, mocker):
+        # Arrange
+        obj = {"name": "model", "schema": mocker.MagicMock(to_dict=lambda: {"a": 1})}
+
+        # Act
+        payload = util.json_dumps_bytes(obj)
+        mocker.patch("hopsworks_common.util.HAS_ORJSON", False)
+        json_payload = util.json_dumps_bytes(obj)
+
+        # Assert
+        assert isinstance(payload, bytes)
+        assert pyjson.loads(payload) == pyjson.loads(json_payload)
+
     def test_extract_field_from_json(self, mocker):
         # Arrange
         json = {"a": "1", "b": "2"}